@@ -1,5 +1,5 @@
 import os
-from typing import Any, Optional, Tuple
+from typing import Any, Optional, Tuple, Union
 
 import intel_extension_for_pytorch as ipex
 import torch
@@ -17,6 +17,22 @@ except ImportError:
         pass
 
 
+# Dtypes handled by the ipex paged attention kernels. When the cache dtype differs from the model dtype, key / value
+# states are cast when written to the cache and the query is cast to the cache dtype before the paged attention.
+_IPEX_PAGED_CACHE_SUPPORTED_DTYPES = (torch.float32, torch.bfloat16, torch.float16)
+
+
+def _parse_kv_cache_dtype(kv_cache_dtype: Union[str, torch.dtype]) -> torch.dtype:
+    dtype = kv_cache_dtype
+    if isinstance(kv_cache_dtype, str):
+        dtype = getattr(torch, kv_cache_dtype.replace("torch.", ""), None)
+    if dtype not in _IPEX_PAGED_CACHE_SUPPORTED_DTYPES:
+        raise ValueError(
+            f"Unsupported kv_cache_dtype {kv_cache_dtype}, supported dtypes are {_IPEX_PAGED_CACHE_SUPPORTED_DTYPES}"
+        )
+    return dtype
+
+
 class IPEXCacheLayer(CacheLayerMixin):
     """
     A cache layer for IPEX PagedAttention that stores key and value states
@@ -145,6 +161,10 @@ class IPEXPagedCache(Cache):
         default_device = torch.device("xpu") if ipex._C._has_xpu() else torch.device("cpu")
         device = device or default_device
         self.device = device
+        # The KV cache can be stored in a lower precision than the model (e.g. bfloat16) to reduce memory bandwidth.
+        kv_cache_dtype = getattr(config, "kv_cache_dtype", None)
+        if kv_cache_dtype is not None:
+            dtype = _parse_kv_cache_dtype(kv_cache_dtype)
 
         # Set up cache-related attributes
         self.num_kv_heads = config.num_key_value_heads
@@ -286,6 +306,10 @@ class IPEXPagedCache(Cache):
             A tuple containing the updated key and value states.
         """
 
+        cache_dtype = self.layers[layer_idx].keys.dtype
+        if key_states.dtype != cache_dtype:
+            key_states = key_states.to(cache_dtype)
+            value_states = value_states.to(cache_dtype)
         self.reshape_and_cache(
             key_states, value_states, self.layers[layer_idx].keys, self.layers[layer_idx].values, self.slots
         )
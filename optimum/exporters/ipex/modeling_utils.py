@@ -912,6 +912,7 @@ class _IPEXAttention(nn.Module):
         max_input_lens,
         query_max_len,
     ):
+        output_dtype = query.dtype
         if past_key_value is None:
             n_rep = query.shape[1] // key.shape[1]
             attn_output = torch.nn.functional.scaled_dot_product_attention(
@@ -928,6 +929,8 @@ class _IPEXAttention(nn.Module):
             )
             self.use_sdpa = True
         elif self.has_flash_attn():
+            # The paged kernels expect the query in the KV cache dtype, which may differ from the model dtype.
+            query = query.to(key_cache.dtype)
             attn_output = torch.empty_like(query)
             PagedAttention.flash_attn_varlen_func(
                 attn_output,
@@ -964,6 +967,7 @@ class _IPEXAttention(nn.Module):
             )
         else:
             # decode
+            query = query.to(key_cache.dtype)
             attn_output = torch.empty_like(query)
             PagedAttention.single_query_cached_kv_attention(
                 attn_output,
@@ -979,7 +983,7 @@ class _IPEXAttention(nn.Module):
                 None,
             )
 
-        return attn_output
+        return attn_output.to(output_dtype)
 
     def forward(
         self,
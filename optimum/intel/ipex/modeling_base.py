@@ -13,15 +13,18 @@
 #  limitations under the License.
 
 
+import contextlib
 import inspect
 import logging
 import os
+from functools import lru_cache
 from pathlib import Path
 from tempfile import TemporaryDirectory
 from typing import Dict, Optional, Tuple, Union
 
 import torch
 import transformers
+from torch.utils._pytree import tree_map_only
 from transformers import (
     AutoConfig,
     AutoModel,
@@ -46,33 +49,38 @@ from optimum.exporters.tasks import TasksManager
 from optimum.modeling_base import OptimizedModel
 from optimum.utils import NormalizedConfigManager
 
-from ...exporters.ipex.cache_utils import IPEXPagedCache
+from ...exporters.ipex.cache_utils import IPEXPagedCache, _parse_kv_cache_dtype
 from ...exporters.ipex.model_patcher import (
     _IPEX_EXPORTED_GENERATION_TASKS,
     _IPEX_MINIMUM_VERSION_FOR_PATCHING,
     _patch_model,
 )
 from ..utils.constant import _TASK_ALIASES
-from ..utils.import_utils import is_ipex_version, is_torch_version, is_transformers_version
-from ..utils.modeling_utils import recursive_to_device
+from ..utils.import_utils import is_ipex_available, is_ipex_version, is_torch_version, is_transformers_version
 
 
 logger = logging.getLogger(__name__)
 
 
-_IPEX_SUPPORT_MODEL_TYPES = ("llama", "bert", "vit", "falcon", "gpt2", "qwen2", "mistral")
+_IPEX_SUPPORT_MODEL_TYPES = frozenset(("llama", "bert", "vit", "falcon", "gpt2", "qwen2", "mistral"))
 _IPEX_EXPORTED_GENERATION_METHODS = ("sample", "greedy_search", "beam_sample", "beam_search", "assisted_generation")
 _IPEX_MINIMUM_VERSION_FOR_COMPILE = "2.5.0"
+# Evaluated once at import time to avoid parsing versions on every model instantiation.
+_IS_IPEX_VERSION_SUPPORTED_FOR_PATCHING = not is_ipex_version("<", _IPEX_MINIMUM_VERSION_FOR_PATCHING)
+_IS_IPEX_VERSION_SUPPORTED_FOR_COMPILE = not is_ipex_version("<", _IPEX_MINIMUM_VERSION_FOR_COMPILE)
+_COMPILE_NOT_READY_MODEL_TYPES_WITHOUT_CACHE = frozenset()
 # Page attention model cannot use torch.compile for now.
 if is_torch_version("<", "2.6"):
-    _COMPILE_NOT_READY_MODEL_TYPES = ("electra", "roformer", "gpt_neox", "beit", "llama", "falcon", "gpt2", "qwen2")
+    _COMPILE_NOT_READY_MODEL_TYPES = frozenset(
+        ("electra", "roformer", "gpt_neox", "beit", "llama", "falcon", "gpt2", "qwen2")
+    )
 elif is_torch_version("<", "2.7"):
-    _COMPILE_NOT_READY_MODEL_TYPES = ("llama", "falcon", "gpt2", "qwen2", "mistral")
+    _COMPILE_NOT_READY_MODEL_TYPES = frozenset(("llama", "falcon", "gpt2", "qwen2", "mistral"))
 else:
-    _COMPILE_NOT_READY_MODEL_TYPES = ("mistral",)
+    _COMPILE_NOT_READY_MODEL_TYPES = frozenset(("mistral",))
     # It's an regresson in torch/ipex 2.8.
     # TODO: Figure it out and fix it.
-    _COMPILE_NOT_READY_MODEL_TYPES_WITHOUT_CACHE = ("gpt2", "gpt_bigcode")
+    _COMPILE_NOT_READY_MODEL_TYPES_WITHOUT_CACHE = frozenset(("gpt2", "gpt_bigcode"))
 
 
 try:
@@ -86,12 +94,96 @@ except ImportError:
     logger.warning("No intel_extension_for_pytorch found, please `pip install intel_extension_for_pytorch`")
 
 
-def _is_patched_with_ipex(model, task, use_cache: bool = True):
-    if is_ipex_version("<", _IPEX_MINIMUM_VERSION_FOR_PATCHING):
+@lru_cache(maxsize=128)
+def _is_patched_with_ipex_cached(model_type: str, task: str, use_cache: bool) -> bool:
+    if not _IS_IPEX_VERSION_SUPPORTED_FOR_PATCHING:
         return False
     if not use_cache and task in _IPEX_EXPORTED_GENERATION_TASKS:
         return False
-    return model.config.model_type in _IPEX_SUPPORT_MODEL_TYPES
+    return model_type in _IPEX_SUPPORT_MODEL_TYPES
+
+
+def _is_patched_with_ipex(model, task, use_cache: bool = True):
+    return _is_patched_with_ipex_cached(model.config.model_type, task, bool(use_cache))
+
+
+@lru_cache(maxsize=128)
+def _can_compile_cached(
+    model_type: str, device_type: str, use_cache: bool, supports_cache_class: bool, add_patch: bool, quantized: bool
+) -> bool:
+    if (
+        device_type != "cpu"
+        or model_type in _COMPILE_NOT_READY_MODEL_TYPES
+        or not _IS_IPEX_VERSION_SUPPORTED_FOR_COMPILE
+        or quantized
+    ):
+        return False
+
+    if use_cache and not supports_cache_class and not add_patch:
+        return False
+
+    if not use_cache and model_type in _COMPILE_NOT_READY_MODEL_TYPES_WITHOUT_CACHE:
+        return False
+
+    return True
+
+
+_RUNTIME_CONFIGURED = False
+_IPEX_PAGED_CACHE_REGISTERED = False
+
+
+def _configure_cpu_runtime():
+    # Opt-in intra-op thread count. OpenMP / oneDNN settings such as KMP_AFFINITY or ONEDNN_PRIMITIVE_CACHE_CAPACITY
+    # are only read at process start, so they need to be set when launching the process instead.
+    global _RUNTIME_CONFIGURED
+    if _RUNTIME_CONFIGURED:
+        return
+    _RUNTIME_CONFIGURED = True
+    num_threads = os.environ.get("IPEX_NUM_THREADS", None)
+    if num_threads is None:
+        return
+    try:
+        num_threads = int(num_threads)
+    except ValueError:
+        num_threads = 0
+    if num_threads <= 0:
+        logger.warning(f"Ignoring IPEX_NUM_THREADS={os.environ['IPEX_NUM_THREADS']}, expected a positive integer.")
+        return
+    torch.set_num_threads(num_threads)
+
+
+def _register_ipex_paged_cache():
+    # Registers the ipex_paged cache implementation into transformers generation once per process.
+    global _IPEX_PAGED_CACHE_REGISTERED
+    if _IPEX_PAGED_CACHE_REGISTERED:
+        return
+    transformers.generation.utils.NEED_SETUP_CACHE_CLASSES_MAPPING["ipex_paged"] = IPEXPagedCache
+    if is_transformers_version(">=", "4.45.0"):
+        if "ipex_paged" not in transformers.generation.configuration_utils.ALL_CACHE_IMPLEMENTATIONS:
+            transformers.generation.configuration_utils.ALL_CACHE_IMPLEMENTATIONS.append("ipex_paged")
+    _IPEX_PAGED_CACHE_REGISTERED = True
+
+
+@lru_cache(maxsize=64)
+def _normalized_config_class(model_type: str):
+    return NormalizedConfigManager.get_normalized_config_class(model_type)
+
+
+@lru_cache(maxsize=64)
+def _cached_forward_arg_names(fn) -> frozenset:
+    code = getattr(fn, "__code__", None)
+    if code is None or code.co_flags & (inspect.CO_VARARGS | inspect.CO_VARKEYWORDS):
+        names = inspect.signature(fn).parameters
+    else:
+        # Named arguments are stored first in co_varnames, reading them avoids building a full signature.
+        names = code.co_varnames[: code.co_argcount + code.co_kwonlyargcount]
+    return frozenset(name for name in names if name != "self")
+
+
+def _forward_arg_names(forward) -> frozenset:
+    # Key the cache on the underlying function instead of the bound method so no model instance is kept alive.
+    forward = inspect.unwrap(forward)
+    return _cached_forward_arg_names(getattr(forward, "__func__", forward))
 
 
 def get_float_type(model_dtype: torch.dtype):
@@ -105,7 +197,7 @@ def get_float_type(model_dtype: torch.dtype):
 
 def prepare_jit_inputs(model: PreTrainedModel, task: str, use_cache: bool = False):
     task = _TASK_ALIASES.get(task, task)
-    signature = inspect.signature(model.forward) if hasattr(model, "forward") else inspect.signature(model.__call__)
+    forward_params = _forward_arg_names(model.forward if hasattr(model, "forward") else model.__call__)
     onnx_config_class = TasksManager.get_exporter_config_constructor(model=model, exporter="onnx", task=task)
     float_dtype = get_float_type(model.dtype)
     if "text-generation" in task:
@@ -117,11 +209,9 @@ def prepare_jit_inputs(model: PreTrainedModel, task: str, use_cache: bool = Fals
 
     dummy_inputs = onnx_config.generate_dummy_inputs(framework="pt")
 
-    return {
-        key: recursive_to_device(dummy_inputs[key], model.device)
-        for key in signature.parameters
-        if dummy_inputs.get(key, None) is not None
-    }
+    inputs = {key: value for key, value in dummy_inputs.items() if value is not None and key in forward_params}
+
+    return tree_map_only(torch.Tensor, lambda t: t.to(model.device, non_blocking=True), inputs)
 
 
 class IPEXModel(OptimizedModel):
@@ -141,7 +231,6 @@ class IPEXModel(OptimizedModel):
     ):
         config = config or model.config
         OptimizedModel.__init__(self, model=model, config=config)
-
         self._supports_cache_class = getattr(model, "_supports_cache_class", None)
         self._supports_sdpa = getattr(model, "_supports_sdpa", None)
         self._supports_quantized_cache = getattr(model, "_supports_quantized_cache", None)
@@ -152,21 +241,47 @@ class IPEXModel(OptimizedModel):
         self.use_cache = kwargs.get("use_cache", False)
         self.model_save_dir = model_save_dir
         self._add_patch = _is_patched_with_ipex(model, self.export_feature, self.use_cache)
+        if self.model.device.type == "cpu":
+            _configure_cpu_runtime()
         self.model.config.compile = self.can_compile()
+        # Opt-in oneDNN weight prepacking for models without ipex patching running in eager mode.
+        if not self._add_patch and not self.model.config.compile and self.can_ipex_optimize():
+            self.apply_ipex_optimize()
+
+        # Opt-in bf16 autocast on CPUs with native bf16 support, patched models manage their own dtypes.
+        self._bf16_autocast = (
+            not self._add_patch
+            and self.model.device.type == "cpu"
+            and self._dtype != torch.bfloat16
+            and os.environ.get("IPEX_BF16_AUTOCAST", "0") == "1"
+            and torch.ops.mkldnn._is_mkldnn_bf16_supported()
+        )
 
-        self.input_names = set(inspect.signature(model.forward).parameters)
+        self.input_names = _forward_arg_names(model.forward)
 
         if self._add_patch:
             model = _patch_model(model)
-        # Registers the IPEXModelForXXX classes into the transformers AutoModel classes to avoid warnings when creating
-        # a pipeline https://github.com/huggingface/transformers/blob/cad61b68396a1a387287a8e2e2fef78a25b79383/src/transformers/pipelines/base.py#L863
-        AutoConfig.register(self.base_model_prefix, AutoConfig)
-        if hasattr(self.auto_model_class, "register"):
-            self.auto_model_class.register(AutoConfig, self.__class__)
-
+        # IPEX models are only used for inference, so avoid recording autograd metadata for the weights. Done after
+        # patching and ipex.optimize since both create new parameters.
+        self.model.requires_grad_(False)
         if getattr(self.model.config, "compile", False):
             self.apply_torch_compile()
 
+        # Forward arguments of the final (patched / compiled) model, checked by transformers on every generate() call
+        self._forward_params = _forward_arg_names(self.model.forward)
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._register_auto_classes()
+
+    @classmethod
+    def _register_auto_classes(cls):
+        # Registers the IPEXModelForXXX classes into the transformers AutoModel classes to avoid warnings when creating
+        # a pipeline https://github.com/huggingface/transformers/blob/cad61b68396a1a387287a8e2e2fef78a25b79383/src/transformers/pipelines/base.py#L863
+        AutoConfig.register(cls.base_model_prefix, AutoConfig, exist_ok=True)
+        if hasattr(cls.auto_model_class, "register"):
+            cls.auto_model_class.register(AutoConfig, cls, exist_ok=True)
+
     @classmethod
     def from_pretrained(
         cls,
@@ -196,9 +311,13 @@ class IPEXModel(OptimizedModel):
         kwargs["safe_serialization"] = False
         return self.model.push_to_hub(*args, **kwargs)
 
+    def _autocast_context(self):
+        return torch.autocast("cpu", dtype=torch.bfloat16) if self._bf16_autocast else contextlib.nullcontext()
+
     @torch.no_grad()
     def forward(self, *args, **kwargs):
-        return self.model(*args, **kwargs)
+        with self._autocast_context():
+            return self.model(*args, **kwargs)
 
     def eval(self):
         self.model.eval()
@@ -230,6 +349,22 @@ class IPEXModel(OptimizedModel):
     def add_patch(self) -> bool:
         return self._add_patch
 
+    def _supports_logits_to_keep(self) -> bool:
+        """
+        Return True if the current model supports the keyword argument `logits_to_keep` in forward()
+        to save memory. Checking it in this way allows to avoid using a new model attribute.
+        """
+        return "logits_to_keep" in self._forward_params
+
+    def _supports_num_logits_to_keep(self) -> bool:
+        """
+        Will be deprecated after we no longer support transformers < 4.49
+
+        Return True if the current model supports the keyword argument `num_logits_to_keep` in forward()
+        to save memory. Checking it in this way allows to avoid using a new model attribute.
+        """
+        return "num_logits_to_keep" in self._forward_params
+
     def to(self, device: Union[torch.device, str]):
         self.model.to(device)
         return self
@@ -238,22 +373,39 @@ class IPEXModel(OptimizedModel):
         return isinstance(self, GenerationMixin)
 
     def can_compile(self):
+        return _can_compile_cached(
+            self.model.config.model_type,
+            self.model.device.type,
+            bool(self.use_cache),
+            bool(self._supports_cache_class),
+            bool(self._add_patch),
+            bool(getattr(self.model.config, "quantization_config", None)),
+        )
+
+    def can_ipex_optimize(self):
         if (
-            self.model.device.type != "cpu"
-            or self.model.config.model_type in _COMPILE_NOT_READY_MODEL_TYPES
-            or is_ipex_version("<", _IPEX_MINIMUM_VERSION_FOR_COMPILE)
+            os.environ.get("IPEX_OPTIMIZE", "0") != "1"
+            or not is_ipex_available()
+            or self.model.device.type != "cpu"
             or getattr(self.model.config, "quantization_config", None)
         ):
             return False
-
-        if self.use_cache and not self._supports_cache_class and not self._add_patch:
-            return False
-
-        if not self.use_cache and self.model.config.model_type in _COMPILE_NOT_READY_MODEL_TYPES_WITHOUT_CACHE:
-            return False
-
+        # Half precision weight prepacking is only supported on CPUs with native bf16 / fp16 instructions.
+        if self._dtype == torch.bfloat16:
+            return torch.ops.mkldnn._is_mkldnn_bf16_supported()
+        if self._dtype == torch.float16:
+            return torch.ops.mkldnn._is_mkldnn_fp16_supported()
         return True
 
+    def apply_ipex_optimize(self):
+        optimize_kwargs = {"inplace": True, "weights_prepack": True, "auto_kernel_selection": True}
+        if is_ipex_version(">=", "2.1.0"):
+            optimize_kwargs["concat_linear"] = True
+        # ipex.optimize only converts weights to bf16 / fp16, fp32 models are kept as is
+        dtype = self._dtype if self._dtype in (torch.bfloat16, torch.float16) else None
+        logger.info("Enable ipex.optimize optimization")
+        self.model = ipex.optimize(self.model.eval(), dtype=dtype, **optimize_kwargs)
+
     def apply_torch_compile(self):
         from torch._inductor import config as inductor_config
 
@@ -266,8 +418,15 @@ class IPEXModel(OptimizedModel):
             inductor_config.cpp_wrapper = False
 
         os.environ["TORCHINDUCTOR_FREEZING"] = "1"
+        # The compile mode can be overridden for experimentation, torch.compile defaults are used otherwise.
+        compile_kwargs = {}
+        if os.environ.get("IPEX_COMPILE_MODE", None):
+            compile_kwargs["mode"] = os.environ["IPEX_COMPILE_MODE"]
         logger.info("Enable torch.compile optimization")
-        self.model.forward = torch.compile(self.model.forward)
+        self.model.forward = torch.compile(self.model.forward, **compile_kwargs)
+
+
+IPEXModel._register_auto_classes()
 
 
 class IPEXModelForSequenceClassification(IPEXModel):
@@ -318,10 +477,14 @@ class IPEXModelForCausalLM(IPEXModel, GenerationMixin):
         super().__init__(model, config, model_save_dir=model_save_dir, use_cache=use_cache)
         if self._add_patch:
             self._supports_cache_class = True
+            _register_ipex_paged_cache()
+        # The patched model relies on the attention mask to build the paged attention inputs.
+        self._needs_default_mask = self._add_patch
+        self._attn_mask_cache: Optional[torch.Tensor] = None
         GenerationMixin.__init__(self)
 
         model_type = self.config.model_type
-        self.normalized_config = NormalizedConfigManager.get_normalized_config_class(model_type)(self.config)
+        self.normalized_config = _normalized_config_class(model_type)(self.config)
 
         self.config.is_decoder = True
         self.config.is_encoder_decoder = False
@@ -344,6 +507,42 @@ class IPEXModelForCausalLM(IPEXModel, GenerationMixin):
         if hasattr(self.model_cls, "_convert_to_bloom_cache"):
             self._convert_to_bloom_cache = self.model_cls._convert_to_bloom_cache
 
+    @classmethod
+    def from_pretrained(
+        cls,
+        model_id: Union[str, Path],
+        kv_cache_dtype: Optional[Union[str, torch.dtype]] = None,
+        **kwargs,
+    ):
+        """
+        Loads a model and its configuration file from a directory or the HF Hub.
+
+        Arguments:
+            model_id (`str` or `Path`):
+                The directory from which to load the model.
+                Can be either:
+                    - The model id of a pretrained model hosted inside a model repo on huggingface.co.
+                    - The path to a directory containing the model weights.
+            kv_cache_dtype (`str` or `torch.dtype`, *optional*):
+                The dtype of the ipex paged KV cache, one of `torch.float32`, `torch.bfloat16` or `torch.float16`.
+                Defaults to the model dtype. The dtype is stored in the model config, so a saved model keeps using
+                it when reloaded.
+        """
+        model = super().from_pretrained(model_id, **kwargs)
+        if kv_cache_dtype is not None:
+            model._set_kv_cache_dtype(kv_cache_dtype)
+        return model
+
+    def _set_kv_cache_dtype(self, kv_cache_dtype: Union[str, torch.dtype]):
+        kv_cache_dtype = _parse_kv_cache_dtype(kv_cache_dtype)
+        if not self._add_patch:
+            logger.warning(
+                "`kv_cache_dtype` is only supported for models patched with ipex paged attention, ignoring it."
+            )
+            return
+        # Stored in the config as a string so that it is serializable and read by IPEXPagedCache at setup.
+        self.config.kv_cache_dtype = str(kv_cache_dtype).replace("torch.", "")
+
     @torch.no_grad()
     def forward(
         self,
@@ -351,19 +550,28 @@ class IPEXModelForCausalLM(IPEXModel, GenerationMixin):
         attention_mask: Optional[torch.FloatTensor] = None,
         **kwargs,
     ) -> CausalLMOutputWithPast:
-        if self.add_patch:
-            if input_ids is not None and attention_mask is None:
-                attention_mask = torch.ones_like(input_ids)
+        if self._needs_default_mask and attention_mask is None and input_ids is not None:
+            attention_mask = self._get_default_attention_mask(input_ids)
 
+        if self._add_patch:
             kwargs = self.prepare_page_attn_inputs(input_ids, attention_mask, **kwargs)
 
-        results = self.model(input_ids=input_ids, attention_mask=attention_mask, **kwargs)
+        with self._autocast_context():
+            results = self.model(input_ids=input_ids, attention_mask=attention_mask, **kwargs)
 
-        if self.add_patch and self.use_cache and results.get("past_key_values", None) is not None:
+        if self._add_patch and self.use_cache and results.get("past_key_values", None) is not None:
             self.postprocess_ipex_paged_cache(results["past_key_values"], kwargs["input_lens"])
 
         return results
 
+    def _get_default_attention_mask(self, input_ids):
+        # The all-ones mask is only read, so it can be reused as long as the input shape and device do not change.
+        mask = self._attn_mask_cache
+        if mask is None or mask.shape != input_ids.shape or mask.device != input_ids.device:
+            mask = torch.ones(input_ids.shape, dtype=torch.long, device=input_ids.device)
+            self._attn_mask_cache = mask
+        return mask
+
     def prepare_page_attn_inputs(self, input_ids, attention_mask, **kwargs):
         if not hasattr(self, "batch_size") or (input_ids.shape[0] != getattr(self, "batch_size", 0)):
             self.batch_size = input_ids.shape[0]
@@ -448,54 +656,35 @@ class IPEXModelForCausalLM(IPEXModel, GenerationMixin):
 
     def prepare_inputs_for_generation(self, *args, **kwargs):
         input_kwargs = self.model.prepare_inputs_for_generation(*args, **kwargs)
-        if self.add_patch:
+        if self._add_patch:
             # Only need to change back original attention_mask when model is patched to adapt to ipex paged attn API
             input_kwargs["attention_mask"] = kwargs.get("attention_mask", None)
         return input_kwargs
 
-    def _supports_logits_to_keep(self) -> bool:
-        """
-        Return True if the current model supports the keyword argument `logits_to_keep` in forward()
-        to save memory. Checking it in this way allows to avoid using a new model attribute.
-        """
-        return "logits_to_keep" in set(inspect.signature(self.model.forward).parameters.keys())
-
-    def _supports_num_logits_to_keep(self) -> bool:
-        """
-        Will be deprecated after we no longer support transformers < 4.49
-
-        Return True if the current model supports the keyword argument `num_logits_to_keep` in forward()
-        to save memory. Checking it in this way allows to avoid using a new model attribute.
-        """
-        return "num_logits_to_keep" in set(inspect.signature(self.model.forward).parameters.keys())
-
     def generate(self, *args, **kwargs):
         if self._add_patch and kwargs.get("assistant_model", None):
             raise ValueError(
                 f"Assisted decoding is not supported for patched models for now, support methods are {_IPEX_EXPORTED_GENERATION_METHODS}"
             )
-        # Patch functions to support ipex_paged cache
-        if self._add_patch:
-            transformers.generation.utils.NEED_SETUP_CACHE_CLASSES_MAPPING["ipex_paged"] = IPEXPagedCache
-            self.generation_config.cache_implementation = "ipex_paged"
-            if is_transformers_version(">=", "4.45.0"):
-                if "ipex_paged" not in transformers.generation.configuration_utils.ALL_CACHE_IMPLEMENTATIONS:
-                    transformers.generation.configuration_utils.ALL_CACHE_IMPLEMENTATIONS.append("ipex_paged")
-            if kwargs.get("generation_config", None):
-                # Change cache implementation temporarily
-                orig_cache_implementation = kwargs["generation_config"].cache_implementation
-                kwargs["generation_config"].cache_implementation = "ipex_paged"
-
+        if not self._add_patch:
+            return super().generate(*args, **kwargs)
+
+        with self._ipex_generation_patches(kwargs.get("generation_config", None)):
+            return super().generate(*args, **kwargs)
+
+    @contextlib.contextmanager
+    def _ipex_generation_patches(self, generation_config: Optional[GenerationConfig] = None):
+        # Use the ipex_paged cache for this call, a user provided generation config is restored even if generation fails
+        self.generation_config.cache_implementation = "ipex_paged"
+        if generation_config is None:
+            yield
+            return
+        orig_cache_implementation = generation_config.cache_implementation
+        generation_config.cache_implementation = "ipex_paged"
         try:
-            result = super().generate(*args, **kwargs)
-        except Exception as e:
-            raise e
-
-        # change back cache_implementation
-        if self._add_patch and kwargs.get("generation_config", None):
-            kwargs["generation_config"].cache_implementation = orig_cache_implementation
-
-        return result
+            yield
+        finally:
+            generation_config.cache_implementation = orig_cache_implementation
 
 
 class IPEXModelForSeq2SeqLM(IPEXModel, GenerationMixin):
@@ -514,7 +703,7 @@ class IPEXModelForSeq2SeqLM(IPEXModel, GenerationMixin):
         GenerationMixin.__init__(self)
 
         model_type = self.config.model_type
-        self.normalized_config = NormalizedConfigManager.get_normalized_config_class(model_type)(self.config)
+        self.normalized_config = _normalized_config_class(model_type)(self.config)
 
         self.config.is_decoder = False
         self.config.is_encoder_decoder = True
@@ -542,7 +731,8 @@ class IPEXModelForSeq2SeqLM(IPEXModel, GenerationMixin):
         attention_mask: Optional[torch.FloatTensor] = None,
         **kwargs,
     ) -> CausalLMOutputWithPast:
-        return self.model(input_ids=input_ids, attention_mask=attention_mask, **kwargs)
+        with self._autocast_context():
+            return self.model(input_ids=input_ids, attention_mask=attention_mask, **kwargs)
 
     def _prepare_generation_config(
         self, generation_config: Optional[GenerationConfig], use_model_defaults: Optional[bool] = None, **kwargs: Dict
@@ -580,19 +770,3 @@ class IPEXModelForSeq2SeqLM(IPEXModel, GenerationMixin):
 
     def get_encoder(self, *args, **kwargs):
         return self.model.get_encoder(*args, **kwargs)
-
-    def _supports_logits_to_keep(self) -> bool:
-        """
-        Return True if the current model supports the keyword argument `logits_to_keep` in forward()
-        to save memory. Checking it in this way allows to avoid using a new model attribute.
-        """
-        return "logits_to_keep" in set(inspect.signature(self.model.forward).parameters.keys())
-
-    def _supports_num_logits_to_keep(self) -> bool:
-        """
-        Will be deprecated after we no longer support transformers < 4.49
-
-        Return True if the current model supports the keyword argument `num_logits_to_keep` in forward()
-        to save memory. Checking it in this way allows to avoid using a new model attribute.
-        """
-        return "num_logits_to_keep" in set(inspect.signature(self.model.forward).parameters.keys())
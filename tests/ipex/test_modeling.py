@@ -14,12 +14,15 @@
 
 # ruff: noqa
 
+import os
 import tempfile
 import time
 import unittest
+import unittest.mock
 import numpy as np
 import requests
 import torch
+import intel_extension_for_pytorch as ipex
 from typing import Generator
 from parameterized import parameterized
 from PIL import Image
@@ -107,6 +110,50 @@ class IPEXModelTest(unittest.TestCase):
                 self.assertTrue(torch.allclose(outputs[output_name], loaded_model_outputs[output_name]))
                 self.assertTrue(torch.allclose(outputs[output_name], init_model_outputs[output_name]))
 
+    @unittest.skipIf(IS_XPU_AVAILABLE, reason="ipex.optimize is only applied on CPU")
+    def test_ipex_optimize(self):
+        model_id = MODEL_NAMES["roberta"]
+        set_seed(SEED)
+        with unittest.mock.patch.dict(os.environ, {"IPEX_OPTIMIZE": "1"}), unittest.mock.patch.object(
+            self.IPEX_MODEL_CLASS, "can_compile", return_value=False
+        ), unittest.mock.patch("intel_extension_for_pytorch.optimize", wraps=ipex.optimize) as optimize:
+            ipex_model = self.IPEX_MODEL_CLASS.from_pretrained(model_id)
+        self.assertFalse(ipex_model.add_patch)
+        optimize.assert_called_once()
+        set_seed(SEED)
+        transformers_model = self.IPEX_MODEL_CLASS.auto_model_class.from_pretrained(model_id)
+        tokenizer = AutoTokenizer.from_pretrained(model_id)
+        tokens = tokenizer("This is a sample input", return_tensors="pt")
+        with torch.no_grad():
+            transformers_outputs = transformers_model(**tokens)
+        outputs = ipex_model(**tokens)
+        for output_name in {"logits", "last_hidden_state"}:
+            if output_name in transformers_outputs:
+                self.assertTrue(torch.allclose(outputs[output_name], transformers_outputs[output_name], atol=1e-3))
+
+    @unittest.skipIf(IS_XPU_AVAILABLE, reason="bf16 autocast is only applied on CPU")
+    def test_bf16_autocast(self):
+        model_id = MODEL_NAMES["roberta"]
+        with unittest.mock.patch.dict(os.environ, {"IPEX_BF16_AUTOCAST": "1"}), unittest.mock.patch.object(
+            self.IPEX_MODEL_CLASS, "can_compile", return_value=False
+        ), unittest.mock.patch("torch.ops.mkldnn._is_mkldnn_bf16_supported", return_value=True):
+            ipex_model = self.IPEX_MODEL_CLASS.from_pretrained(model_id, torch_dtype=torch.float32)
+        self.assertTrue(ipex_model._bf16_autocast)
+        tokenizer = AutoTokenizer.from_pretrained(model_id)
+        tokens = tokenizer("This is a sample input", return_tensors="pt")
+        autocast_enabled = []
+        model_forward = ipex_model.model.forward
+
+        def forward(*args, **kwargs):
+            autocast_enabled.append(torch.is_autocast_enabled("cpu"))
+            return model_forward(*args, **kwargs)
+
+        with unittest.mock.patch.object(ipex_model.model, "forward", side_effect=forward):
+            outputs = ipex_model(**tokens)
+        self.assertEqual(autocast_enabled, [True])
+        if "logits" in outputs:
+            self.assertEqual(outputs["logits"].dtype, torch.bfloat16)
+
 
 class IPEXModelForSequenceClassificationTest(IPEXModelTest):
     IPEX_MODEL_CLASS = IPEXModelForSequenceClassification
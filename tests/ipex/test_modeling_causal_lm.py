@@ -14,8 +14,10 @@
 
 # ruff: noqa
 
+import os
 import tempfile
 import unittest
+import unittest.mock
 
 import torch
 from parameterized import parameterized
@@ -23,6 +25,7 @@ from transformers import (
     AutoModelForCausalLM,
     AutoTokenizer,
     GenerationConfig,
+    GenerationMixin,
     PretrainedConfig,
     set_seed,
 )
@@ -265,6 +268,9 @@ class IPEXModelForCausalLMTest(unittest.TestCase):
         patched_model_id = MODEL_NAMES["patched_" + model_arch]
         ipex_model = IPEXModelForCausalLM.from_pretrained(model_id, torch_dtype=dtype, device_map=DEVICE)
         exported_model = IPEXModelForCausalLM.from_pretrained(patched_model_id, torch_dtype=dtype, device_map=DEVICE)
+        self.assertTrue(ipex_model.add_patch)
+        # Patching creates new parameters, which must be frozen as well
+        self.assertFalse(any(p.requires_grad for p in ipex_model.model.parameters()))
         tokenizer = AutoTokenizer.from_pretrained(model_id)
         tokens = tokenizer("This is a sample", return_tensors="pt").to(DEVICE)
         ipex_outputs = ipex_model.generate(
@@ -275,6 +281,80 @@ class IPEXModelForCausalLMTest(unittest.TestCase):
         )
         self.assertTrue(torch.allclose(ipex_outputs.logits[0], exported_outputs.logits[0], atol=1e-4))
 
+    def test_torch_compile_mode(self):
+        model_id = MODEL_NAMES["phi"]
+        model = IPEXModelForCausalLM.from_pretrained(model_id, device_map=DEVICE)
+        with unittest.mock.patch.dict(os.environ), unittest.mock.patch("torch.compile") as compile_mock:
+            os.environ.pop("IPEX_COMPILE_MODE", None)
+            model.apply_torch_compile()
+            self.assertEqual(compile_mock.call_args.kwargs, {})
+
+            os.environ["IPEX_COMPILE_MODE"] = "max-autotune"
+            model.apply_torch_compile()
+            self.assertEqual(compile_mock.call_args.kwargs, {"mode": "max-autotune"})
+
+    def test_default_attention_mask(self):
+        model_id = MODEL_NAMES["llama2"]
+        dtype = torch.float16 if IS_XPU_AVAILABLE else torch.float32
+        model = IPEXModelForCausalLM.from_pretrained(model_id, torch_dtype=dtype, device_map=DEVICE)
+        self.assertTrue(model.add_patch)
+        tokenizer = AutoTokenizer.from_pretrained(model_id)
+        tokenizer.pad_token = tokenizer.eos_token
+        previous_mask = None
+        for text in ["This is a sample", ["This is a sample", "This is another one"]]:
+            input_ids = tokenizer(text, padding=True, return_tensors="pt").input_ids.to(DEVICE)
+            outputs = model(input_ids=input_ids)
+            # The default mask is rebuilt when the input shape changes
+            self.assertEqual(model._attn_mask_cache.shape, input_ids.shape)
+            self.assertIsNot(model._attn_mask_cache, previous_mask)
+            previous_mask = model._attn_mask_cache
+            # And reused as long as it does not
+            model(input_ids=input_ids)
+            self.assertIs(model._attn_mask_cache, previous_mask)
+            attention_mask = torch.ones(input_ids.shape, dtype=torch.long, device=input_ids.device)
+            expected_outputs = model(input_ids=input_ids, attention_mask=attention_mask)
+            self.assertTrue(torch.allclose(outputs.logits, expected_outputs.logits, atol=1e-7))
+
+    def test_kv_cache_dtype(self):
+        model_id = MODEL_NAMES["llama2"]
+        set_seed(SEED)
+        dtype = torch.float16 if IS_XPU_AVAILABLE else torch.float32
+        kv_cache_dtype = torch.bfloat16
+        model = IPEXModelForCausalLM.from_pretrained(model_id, torch_dtype=dtype, device_map=DEVICE)
+        kv_model = IPEXModelForCausalLM.from_pretrained(
+            model_id, torch_dtype=dtype, device_map=DEVICE, kv_cache_dtype=kv_cache_dtype
+        )
+        self.assertTrue(kv_model.add_patch)
+        self.assertEqual(kv_model.config.kv_cache_dtype, "bfloat16")
+        tokenizer = AutoTokenizer.from_pretrained(model_id)
+        tokens = tokenizer("This is a sample", return_tensors="pt").to(DEVICE)
+        generation_kwargs = {"max_new_tokens": 4, "do_sample": False, "return_dict_in_generate": True}
+        outputs = model.generate(**tokens, output_logits=True, **generation_kwargs)
+        kv_outputs = kv_model.generate(**tokens, output_logits=True, **generation_kwargs)
+        self.assertEqual(kv_outputs.past_key_values.layers[0].keys.dtype, kv_cache_dtype)
+        self.assertEqual(kv_outputs.past_key_values.layers[0].values.dtype, kv_cache_dtype)
+        for logits, kv_logits in zip(outputs.logits, kv_outputs.logits):
+            self.assertEqual(kv_logits.dtype, dtype)
+            self.assertTrue(torch.allclose(logits, kv_logits, atol=5e-2, rtol=1e-2))
+
+        with self.assertRaises(ValueError):
+            IPEXModelForCausalLM.from_pretrained(model_id, torch_dtype=dtype, device_map=DEVICE, kv_cache_dtype="foo")
+
+    def test_generation_config_restored_on_error(self):
+        model_id = MODEL_NAMES["llama2"]
+        model = IPEXModelForCausalLM.from_pretrained(model_id, device_map=DEVICE)
+        self.assertTrue(model.add_patch)
+        generation_config = GenerationConfig(max_new_tokens=4, cache_implementation="static")
+
+        def failing_generate(*args, **kwargs):
+            self.assertEqual(kwargs["generation_config"].cache_implementation, "ipex_paged")
+            raise RuntimeError("generation failed")
+
+        with unittest.mock.patch.object(GenerationMixin, "generate", side_effect=failing_generate):
+            with self.assertRaises(RuntimeError):
+                model.generate(input_ids=torch.ones((1, 4), dtype=torch.long), generation_config=generation_config)
+        self.assertEqual(generation_config.cache_implementation, "static")
+
     @unittest.skipIf(not is_bitsandbytes_available(), reason="Test requires bitsandbytes")
     def test_bnb(self):
         model_id = "PrunaAI/JackFram-llama-68m-bnb-4bit-smashed"